@@ -1,14 +1,22 @@
+import os
+import copy
 import json
-import redis
+import time
+import hashlib
 import datetime
 import requests
-import webbrowser
 import httplib2
 import oauth2client.clientsecrets as clientsecrets
+import queue
+import weakref
 import threading
+import concurrent.futures
 
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+from functools import lru_cache
 from functools import wraps
+from requests.adapters import HTTPAdapter
+from oauth2client import GOOGLE_REVOKE_URI
 from oauth2client.service_account import ServiceAccountCredentials
 from oauth2client.client import OAuth2Credentials
 from oauth2client.client import FlowExchangeError
@@ -21,7 +29,6 @@ from oauth2client.tools import ClientRedirectHandler
 from oauth2client.tools import ClientRedirectServer
 from oauth2client._helpers import scopes_to_string
 
-from .storage.redis import RedisStorage
 from .apiattr import ApiAttribute
 from .apiattr import ApiAttributeMixin
 from .settings import LoadSettingsFile
@@ -30,6 +37,147 @@ from .settings import SettingsError
 from .settings import InvalidConfigError
 
 
+# Access tokens are treated as expired this many seconds before their actual
+# expiry, so that a request issued right now doesn't race the token's deadline.
+TOKEN_EXPIRY_MARGIN = 300
+
+# Access tokens shared by all GoogleAuth instances of the process, keyed by
+# GoogleAuth._token_cache_key(). Values are (access_token, token_expiry).
+_TOKEN_CACHE = {}
+
+# Parsed discovery documents shared by all GoogleAuth instances of the
+# process, keyed by API name and version. Services themselves hold the
+# instance's authorized Http object and are built per instance.
+_DISCOVERY_CACHE = {}
+
+# Per-thread httplib2 connection pools, keyed by HTTP timeout. Shared by the
+# per-thread Http objects of all GoogleAuth instances so that TCP/TLS
+# connections are reused between them.
+_HTTP_TLS = threading.local()
+
+# Connection pools of exited threads, handed over to new threads so that
+# short-lived worker threads don't each open their own connections.
+_HTTP_POOL = queue.LifoQueue(maxsize=32)
+
+# 308's are used by several Google APIs (Drive, YouTube)
+# for Resumable Uploads rather than Permanent Redirects.
+# This asks httplib2 to exclude 308s from the status codes
+# it treats as redirects
+# See also: https://stackoverflow.com/a/59850170/298182
+# http.redirect_codes does not exist in previous versions of httplib2.
+_HTTP_REDIRECT_CODES = getattr(httplib2.Http(), "redirect_codes", None)
+_HTTPLIB2_HAS_REDIRECT_CODES = _HTTP_REDIRECT_CODES is not None
+if _HTTPLIB2_HAS_REDIRECT_CODES:
+    _HTTP_REDIRECT_CODES = frozenset(_HTTP_REDIRECT_CODES - {308})
+
+# Session used for requests made outside of oauth2client (device flow token
+# polling), keeping connections to the token endpoint open between calls.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# Polling interval (in seconds) of the device flow token endpoint when the
+# authorization server doesn't specify one, see RFC 8628.
+_DEVICE_POLL_INTERVAL = 5
+
+# Single worker reading client secrets files while GoogleAuth finishes its
+# initialization, created on first use.
+_PREFETCH_EXECUTOR = None
+_PREFETCH_LOCK = threading.Lock()
+
+
+class _ThreadConnections:
+    """Holds connection pools of a thread, see _thread_connections."""
+
+    def __init__(self, pools):
+        self.pools = pools
+
+
+def _release_connections(pools):
+    try:
+        _HTTP_POOL.put_nowait(pools)
+    except queue.Full:
+        pass
+
+
+def _thread_connections():
+    """Returns connection pools of the current thread.
+
+    A new thread takes over the pools of an exited thread if any, and its
+    own pools are released for reuse once it exits.
+
+    :returns: dict -- httplib2 connection pools keyed by HTTP timeout.
+    """
+    holder = getattr(_HTTP_TLS, "holder", None)
+    if holder is None:
+        try:
+            pools = _HTTP_POOL.get_nowait()
+        except queue.Empty:
+            pools = {}
+        holder = _HTTP_TLS.holder = _ThreadConnections(pools)
+        # Thread-local data is dropped when the thread exits.
+        weakref.finalize(holder, _release_connections, pools)
+    return holder.pools
+
+
+def invalidate_discovery_cache():
+    """Forgets discovery documents loaded by GoogleAuth.Authorize so far."""
+    _DISCOVERY_CACHE.clear()
+
+
+@lru_cache(maxsize=32)
+def _cached_load_clientsecrets(path, mtime_ns, size):
+    return clientsecrets.loadfile(path)
+
+
+def _load_clientsecrets(filename):
+    """Loads client secrets file, reusing the parse of an unchanged file.
+
+    :param filename: path of client secrets file.
+    :type filename: str.
+    :returns: tuple -- client type and client info.
+    :raises: oauth2client.clientsecrets.InvalidClientSecretsError
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        # Let clientsecrets report the missing file.
+        return clientsecrets.loadfile(filename)
+    return copy.deepcopy(
+        _cached_load_clientsecrets(
+            os.path.abspath(filename), stat.st_mtime_ns, stat.st_size
+        )
+    )
+
+
+def _prefetch_clientsecrets(filename):
+    """Starts parsing client secrets file in the background.
+
+    The parse lands in the cache used by :func:`_load_clientsecrets`, errors
+    are left for the foreground load to report.
+
+    :param filename: path of client secrets file.
+    :type filename: str.
+    :returns: concurrent.futures.Future -- future of the parse.
+    """
+    global _PREFETCH_EXECUTOR
+    with _PREFETCH_LOCK:
+        if _PREFETCH_EXECUTOR is None:
+            _PREFETCH_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pydrive2-prefetch"
+            )
+    return _PREFETCH_EXECUTOR.submit(_load_clientsecrets, filename)
+
+
+def _epoch(expiry):
+    """Converts a naive UTC datetime, as used by oauth2client, to epoch time.
+
+    :param expiry: datetime to convert.
+    :type expiry: datetime.datetime.
+    :returns: float -- seconds since the epoch.
+    """
+    return expiry.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
 class AuthError(Exception):
     """Base error for authentication/authorization errors."""
 
@@ -50,43 +198,44 @@ class RefreshError(AuthError):
     """Access token refresh error."""
 
 
+def _LoadAuth(resource):
+    """Checks if the auth of resource is valid and loads auth if not.
+
+    :param resource: object whose methods are decorated with LoadAuth.
+    :returns: GoogleAuth -- the valid auth of resource.
+    """
+    # Initialize auth if needed.
+    if resource.auth is None:
+        resource.auth = GoogleAuth()
+    auth = resource.auth
+    # Re-create access token if it expired.
+    if auth.access_token_expired:
+        if getattr(auth, "auth_method", False) == "service":
+            auth.ServiceAuth()
+        else:
+            auth.LocalWebserverAuth()
+
+    # Initialise service if not built yet.
+    if auth.service is None:
+        auth.Authorize()
+    auth._update_ready_until()
+    return auth
+
+
 def LoadAuth(decoratee):
     """Decorator to check if the auth is valid and loads auth if not."""
 
     @wraps(decoratee)
     def _decorated(self, *args, **kwargs):
-        # Initialize auth if needed.
-        if self.auth is None:
-            self.auth = GoogleAuth()
-        # Re-create access token if it expired.
-        if self.auth.access_token_expired:
-            if getattr(self.auth, "auth_method", False) == "service":
-                self.auth.ServiceAuth()
-            else:
-                self.auth.LocalWebserverAuth()
-
-        # Initialise service if not built yet.
-        if self.auth.service is None:
-            self.auth.Authorize()
-
-        # Ensure that a thread-safe HTTP object is provided.
+        auth = self.auth
+        # Skip the checks while the validated token is still fresh.
         if (
-            kwargs is not None
-            and "param" in kwargs
-            and kwargs["param"] is not None
-            and "http" in kwargs["param"]
-            and kwargs["param"]["http"] is not None
+            auth is None
+            or auth.service is None
+            or time.time() >= auth._ready_until
         ):
-            self.http = kwargs["param"]["http"]
-            del kwargs["param"]["http"]
-
-        else:
-            # If HTTP object not specified, create or resuse an HTTP
-            # object from the thread local storage.
-            if not getattr(self.auth.thread_local, "http", None):
-                self.auth.thread_local.http = self.auth.Get_Http_Object()
-            self.http = self.auth.thread_local.http
-
+            auth = _LoadAuth(self)
+        self.http = auth._ensure_http(kwargs)
         return decoratee(self, *args, **kwargs)
 
     return _decorated
@@ -99,7 +248,7 @@ def CheckServiceAuth(decoratee):
     def _decorated(self, *args, **kwargs):
         self.auth_method = "service"
         dirty = False
-        save_credentials = self.settings.get("save_credentials")
+        save_credentials = self._save_credentials
         if self.credentials is None and save_credentials:
             self.LoadCredentials()
         if self.credentials is None:
@@ -110,7 +259,7 @@ def CheckServiceAuth(decoratee):
             self.Refresh()
             dirty = True
         self.credentials.set_store(self._default_storage)
-        if dirty and save_credentials:
+        if dirty and save_credentials and self._credentials_changed():
             self.SaveCredentials()
 
     return _decorated
@@ -123,7 +272,7 @@ def CheckAuth(decoratee):
     def _decorated(self, *args, **kwargs):
         dirty = False
         code = None
-        save_credentials = self.settings.get("save_credentials")
+        save_credentials = self._save_credentials
         if self.credentials is None and save_credentials:
             self.LoadCredentials()
         if self.flow is None:
@@ -141,7 +290,7 @@ def CheckAuth(decoratee):
         if code is not None:
             self.Auth(code)
         self.credentials.set_store(self._default_storage)
-        if dirty and save_credentials:
+        if dirty and save_credentials and self._credentials_changed():
             self.SaveCredentials()
 
     return _decorated
@@ -170,8 +319,8 @@ class GoogleAuth(ApiAttributeMixin):
         "redirect_uri",
     ]
     SERVICE_CONFIGS_LIST = ["client_user_email"]
-    settings = ApiAttribute("settings")
-    client_config = ApiAttribute("client_config")
+    CLIENT_CONFIGS_FROZENSET = frozenset(CLIENT_CONFIGS_LIST)
+    SERVICE_CONFIGS_FROZENSET = frozenset(SERVICE_CONFIGS_LIST)
     flow = ApiAttribute("flow")
     credentials = ApiAttribute("credentials")
     http = ApiAttribute("http")
@@ -192,6 +341,15 @@ class GoogleAuth(ApiAttributeMixin):
         ApiAttributeMixin.__init__(self)
         self.thread_local = threading.local()
         self.client_config = {}
+        # Epoch time until which LoadAuth may skip checking this instance.
+        self._ready_until = 0.0
+        # Hash of the credentials last saved to or loaded from the default
+        # credentials backend, see _credentials_changed.
+        self._last_saved_hash = None
+        # Epoch time of credentials.token_expiry, converted from the datetime
+        # stored in _expiry_source when it was last seen.
+        self._expiry_epoch = 0.0
+        self._expiry_source = None
 
         if settings is None and settings_file:
             try:
@@ -202,19 +360,72 @@ class GoogleAuth(ApiAttributeMixin):
         self.settings = settings or self.DEFAULT_SETTINGS
         ValidateSettings(self.settings)
 
+        self._client_config_future = None
+        client_config_file = self.settings.get("client_config_file")
+        if (
+            self.settings.get("client_config_backend") == "file"
+            and client_config_file
+            and os.path.exists(client_config_file)
+        ):
+            self._client_config_future = _prefetch_clientsecrets(
+                client_config_file
+            )
+
         storages, default = self._InitializeStoragesFromSettings()
         self._storages = storages
         self._default_storage = default
 
+    @property
+    def settings(self):
+        return self.attr.get("settings")
+
+    @settings.setter
+    def settings(self, settings):
+        self.attr["settings"] = settings
+        # Resolved on assignment, these are read on every authentication.
+        self._save_credentials = bool(settings.get("save_credentials"))
+        self._save_credentials_backend = settings.get(
+            "save_credentials_backend"
+        )
+        self._scopes_str = scopes_to_string(
+            settings.get("oauth_scope") or self.DEFAULT_SETTINGS["oauth_scope"]
+        )
+
+    @property
+    def client_config(self):
+        return self.attr.get("client_config")
+
+    @client_config.setter
+    def client_config(self, client_config):
+        self.attr["client_config"] = client_config
+        # Whether client_config has all of CLIENT_CONFIGS_LIST, only cached
+        # once it does since keys are never removed from it.
+        self._client_config_complete = False
+
     @property
     def access_token_expired(self):
         """Checks if access token doesn't exist or is expired.
 
         :returns: bool -- True if access token doesn't exist or is expired.
         """
-        if self.credentials is None:
+        credentials = self.credentials
+        if credentials is None or credentials.invalid:
             return True
-        return self.credentials.access_token_expired
+        expiry = credentials.token_expiry
+        if expiry is None:
+            return False
+        if expiry is not self._expiry_source:
+            # Credentials were set or refreshed since the last check.
+            self._expiry_source = expiry
+            self._expiry_epoch = _epoch(expiry)
+        return self._expiry_epoch - time.time() < TOKEN_EXPIRY_MARGIN
+
+    def _update_ready_until(self):
+        """Lets LoadAuth skip its checks until current token expires soon."""
+        if self.access_token_expired or self.credentials.token_expiry is None:
+            self._ready_until = 0.0
+        else:
+            self._ready_until = self._expiry_epoch - TOKEN_EXPIRY_MARGIN
 
     @CheckAuth
     def LocalWebserverAuth(
@@ -276,6 +487,8 @@ class GoogleAuth(ApiAttributeMixin):
         self.flow.redirect_uri = oauth_callback
         authorize_url = self.GetAuthUrl()
         if launch_browser:
+            import webbrowser
+
             webbrowser.open(authorize_url, new=1, autoraise=True)
             print("Your browser has been opened to visit:")
         else:
@@ -314,7 +527,7 @@ class GoogleAuth(ApiAttributeMixin):
     @CheckAuth
     def DeviceAuth(self):
         self.flow.client_id = self.client_config.get("client_id")
-        self.flow.scope = scopes_to_string(self.settings.get("oauth_scope"))
+        self.flow.scope = self._scopes_str
         if self.flow.client_id is None:
             raise InvalidConfigError(
                 "client_id is required for Device Authentication"
@@ -325,48 +538,81 @@ class GoogleAuth(ApiAttributeMixin):
             )
 
         user_and_device_code = self.GetDeviceCode()
-        print("Go to the following link in your browser:")
-        print(user_and_device_code.verification_url)
-        print("Enter this code: {}".format(user_and_device_code.user_code))
-        input("Press Enter to continue...")
-
-        resp = requests.post(
-            url=self.flow.token_uri,
-            data={
-                "client_id": self.flow.client_id,
-                "client_secret": self.flow.client_secret,
-                "device_code": user_and_device_code.device_code,
-                "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
-            },
-        )
-        if resp.status_code != 200:
-            raise AuthenticationError("Failed to get access token")
-
-        json_resp = resp.json()
-        self.credentials = OAuth2Credentials.from_json(
-            json_data=dict(
-                client_id=self.flow.client_id,
-                client_secret=self.flow.client_secret,
-                user_agent=self.flow.user_agent,
-                scopes=self.flow.scope,
-                access_token=json_resp["access_token"],
-                refresh_token=json_resp["refresh_token"],
-                token_expiry=datetime.datetime.fromtimestamp(
-                    json_resp["expires_in"] / 1e3
-                ),
-                token_uri=self.flow.token_uri,
+        # Poll the token endpoint in the background while the user visits the
+        # verification url, so that Ctrl-C still works while waiting.
+        stop = threading.Event()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(
+                self._PollDeviceToken, user_and_device_code, stop
             )
+            print("Go to the following link in your browser:")
+            print(user_and_device_code.verification_url)
+            print("Enter this code: {}".format(user_and_device_code.user_code))
+            try:
+                json_resp = future.result()
+            finally:
+                stop.set()
+
+        self.credentials = OAuth2Credentials(
+            access_token=json_resp["access_token"],
+            client_id=self.flow.client_id,
+            client_secret=self.flow.client_secret,
+            refresh_token=json_resp.get("refresh_token"),
+            token_expiry=datetime.datetime.utcnow()
+            + datetime.timedelta(seconds=int(json_resp["expires_in"])),
+            token_uri=self.flow.token_uri,
+            user_agent=self.flow.user_agent,
+            scopes=self.flow.scope,
         )
 
+    def _PollDeviceToken(self, user_and_device_code, stop):
+        """Polls token endpoint until the user authorizes the device.
+
+        :param user_and_device_code: codes returned by GetDeviceCode.
+        :type user_and_device_code: oauth2client.client.DeviceFlowInfo.
+        :param stop: event set to stop polling.
+        :type stop: threading.Event.
+        :returns: dict -- token endpoint response.
+        :raises: AuthenticationError, AuthenticationRejected
+        """
+        interval = user_and_device_code.interval
+        if interval is None:
+            interval = _DEVICE_POLL_INTERVAL
+        expiry = user_and_device_code.user_code_expiry
+        data = {
+            "client_id": self.flow.client_id,
+            "client_secret": self.flow.client_secret,
+            "device_code": user_and_device_code.device_code,
+            "grant_type": "urn:ietf:params:oauth:grant-type:device_code",
+        }
+        while not stop.is_set():
+            resp = _SESSION.post(url=self.flow.token_uri, data=data)
+            if resp.status_code == 200:
+                return resp.json()
+            try:
+                error = resp.json().get("error")
+            except ValueError:
+                error = None
+            if error == "slow_down":
+                interval += 5
+            elif error == "access_denied":
+                raise AuthenticationRejected("User rejected authentication")
+            elif error != "authorization_pending":
+                raise AuthenticationError("Failed to get access token")
+            if expiry is not None and datetime.datetime.utcnow() >= expiry:
+                raise AuthenticationError("Device code expired")
+            stop.wait(interval)
+        raise AuthenticationError("Device authentication was interrupted")
+
     @CheckServiceAuth
     def ServiceAuth(self):
         """Authenticate and authorize using P12 private key, client id
         and client email for a Service account.
         :raises: AuthError, InvalidConfigError
         """
-        if set(self.SERVICE_CONFIGS_LIST) - set(self.client_config):
+        if not self.SERVICE_CONFIGS_FROZENSET.issubset(self.client_config):
             self.LoadServiceConfigSettings()
-        scopes = scopes_to_string(self.settings["oauth_scope"])
+        scopes = self._scopes_str
         keyfile_name = self.client_config.get("client_json_file_path")
         keyfile_dict = self.client_config.get("client_json_dict")
         keyfile_json = self.client_config.get("client_json")
@@ -404,8 +650,7 @@ class GoogleAuth(ApiAttributeMixin):
 
     def _InitializeStoragesFromSettings(self):
         result = {"file": None, "dictionary": None}
-        backend = self.settings.get("save_credentials_backend")
-        save_credentials = self.settings.get("save_credentials")
+        backend = self._save_credentials_backend
         if backend == "file":
             credentials_file = self.settings.get("save_credentials_file")
             if credentials_file is None:
@@ -424,6 +669,10 @@ class GoogleAuth(ApiAttributeMixin):
 
             result[backend] = DictionaryStorage(creds_dict, creds_key)
         elif backend == "redis":
+            # Only import redis when its backend is actually used.
+            import redis
+            from .storage.redis import RedisStorage
+
             result[backend] = RedisStorage(
                 redis.Redis(
                     host=self.settings.get("redis_host")
@@ -436,7 +685,7 @@ class GoogleAuth(ApiAttributeMixin):
                 self.settings.get("redis_key"),
             )
             pass
-        elif save_credentials:
+        elif self._save_credentials:
             raise InvalidConfigError(
                 "Unknown save_credentials_backend: %s" % backend
             )
@@ -450,7 +699,7 @@ class GoogleAuth(ApiAttributeMixin):
         :raises: InvalidConfigError
         """
         if backend is None:
-            backend = self.settings.get("save_credentials_backend")
+            backend = self._save_credentials_backend
             if backend is None:
                 raise InvalidConfigError("Please specify credential backend")
         if backend == "file":
@@ -461,6 +710,8 @@ class GoogleAuth(ApiAttributeMixin):
             self.LoadCredentialsRedis()
         else:
             raise InvalidConfigError("Unknown save_credentials_backend")
+        if self.credentials is not None:
+            self._last_saved_hash = self._credentials_hash()
 
     def LoadCredentialsFile(self, credentials_file=None):
         """Loads credentials or create empty credentials if it doesn't exist.
@@ -529,7 +780,7 @@ class GoogleAuth(ApiAttributeMixin):
         :raises: InvalidConfigError
         """
         if backend is None:
-            backend = self.settings.get("save_credentials_backend")
+            backend = self._save_credentials_backend
             if backend is None:
                 raise InvalidConfigError("Please specify credential backend")
         if backend == "file":
@@ -540,9 +791,22 @@ class GoogleAuth(ApiAttributeMixin):
             self.SaveCredentialsRedis()
         else:
             raise InvalidConfigError("Unknown save_credentials_backend")
+        self._last_saved_hash = self._credentials_hash()
+
+    def _credentials_hash(self):
+        return hash(
+            (self.credentials.access_token, self.credentials.token_expiry)
+        )
+
+    def _credentials_changed(self):
+        """Checks if credentials changed since they were last saved.
+
+        :returns: bool -- True if credentials need to be saved.
+        """
+        return self._credentials_hash() != self._last_saved_hash
 
     def SaveCredentialsRedis(self):
-        storage: RedisStorage = self._storages["redis"]
+        storage = self._storages["redis"]
 
         storage.put(self.credentials)
 
@@ -624,9 +888,7 @@ class GoogleAuth(ApiAttributeMixin):
         if client_config_file is None:
             client_config_file = self.settings["client_config_file"]
         try:
-            client_type, client_info = clientsecrets.loadfile(
-                client_config_file
-            )
+            client_type, client_info = _load_clientsecrets(client_config_file)
         except clientsecrets.InvalidClientSecretsError as error:
             raise InvalidConfigError("Invalid client secrets file %s" % error)
         if client_type not in (
@@ -662,6 +924,7 @@ class GoogleAuth(ApiAttributeMixin):
                 self.client_config[config] = client_info[config]
         except KeyError:
             pass  # The service auth fields are not present, handling code can go here.
+        self._client_config_complete = True
 
     def LoadServiceConfigSettings(self):
         """Loads client configuration from settings.
@@ -684,10 +947,11 @@ class GoogleAuth(ApiAttributeMixin):
                 f"One of {configs} is required for service authentication"
             )
 
+        service_configs = list(self.SERVICE_CONFIGS_LIST)
         if config == "client_pkcs12_file_path":
-            self.SERVICE_CONFIGS_LIST.append("client_service_email")
+            service_configs.append("client_service_email")
 
-        for config in self.SERVICE_CONFIGS_LIST:
+        for config in service_configs:
             try:
                 self.client_config[config] = self.settings["service_config"][
                     config
@@ -711,29 +975,34 @@ class GoogleAuth(ApiAttributeMixin):
                 raise InvalidConfigError(
                     "Insufficient client config in settings"
                 )
+        self._client_config_complete = True
 
     def GetFlow(self):
         """Gets Flow object from client configuration.
 
         :raises: InvalidConfigError
         """
-        if not all(
-            config in self.client_config for config in self.CLIENT_CONFIGS_LIST
-        ):
-            self.LoadClientConfig()
-        constructor_kwargs = {
-            "redirect_uri": self.client_config["redirect_uri"],
-            "auth_uri": self.client_config["auth_uri"],
-            "token_uri": self.client_config["token_uri"],
-            "access_type": "online",
-        }
-        if self.client_config["revoke_uri"] is not None:
-            constructor_kwargs["revoke_uri"] = self.client_config["revoke_uri"]
+        future, self._client_config_future = self._client_config_future, None
+        if future is not None:
+            # Wait for the prefetch so the file is parsed only once, its
+            # errors are raised by LoadClientConfig below if still relevant.
+            future.exception()
+        # Loaders mark client_config complete, a client_config assigned by
+        # the caller is checked once.
+        if not self._client_config_complete:
+            if not self.CLIENT_CONFIGS_FROZENSET.issubset(self.client_config):
+                self.LoadClientConfig()
+            self._client_config_complete = True
+        client_config = self.client_config
         self.flow = OAuth2WebServerFlow(
-            self.client_config["client_id"],
-            self.client_config["client_secret"],
-            scopes_to_string(self.settings["oauth_scope"]),
-            **constructor_kwargs,
+            client_config["client_id"],
+            client_config["client_secret"],
+            self._scopes_str,
+            redirect_uri=client_config["redirect_uri"],
+            auth_uri=client_config["auth_uri"],
+            token_uri=client_config["token_uri"],
+            revoke_uri=client_config["revoke_uri"] or GOOGLE_REVOKE_URI,
+            access_type="online",
         )
         if self.settings.get("get_refresh_token"):
             self.flow.params.update(
@@ -755,12 +1024,69 @@ class GoogleAuth(ApiAttributeMixin):
                 "No refresh_token found."
                 "Please set access_type of OAuth to offline."
             )
+        if self._restore_cached_token():
+            return
+        redis_storage = self._storages.get("redis")
+        if (
+            self.credentials.store is None
+            and redis_storage is not None
+            and self._default_storage is redis_storage
+        ):
+            # oauth2client refreshes under the storage lock and adopts a
+            # token stored meanwhile by another client instead of refreshing.
+            self.credentials.set_store(self._default_storage)
         if self.http is None:
             self.http = self._build_http()
         try:
             self.credentials.refresh(self.http)
         except AccessTokenRefreshError as error:
             raise RefreshError("Access token refresh failed: %s" % error)
+        if (
+            self._default_storage is not None
+            and self.credentials.store is self._default_storage
+        ):
+            # oauth2client already wrote the refreshed token to the storage.
+            self._last_saved_hash = self._credentials_hash()
+        self._cache_token()
+
+    def _token_cache_key(self):
+        """Computes the key identifying current credentials in token cache.
+
+        :returns: str -- hex digest of the credentials identity and scopes.
+        """
+        credentials = self.credentials
+        identity = [
+            credentials.client_id,
+            getattr(credentials, "service_account_email", None),
+            getattr(credentials, "_kwargs", {}).get("sub"),
+            credentials.refresh_token,
+            sorted(self.settings.get("oauth_scope") or []),
+        ]
+        return hashlib.sha256(json.dumps(identity).encode()).hexdigest()
+
+    def _cache_token(self):
+        """Stores access token of current credentials in token cache."""
+        if self.credentials.token_expiry is None:
+            return
+        _TOKEN_CACHE[self._token_cache_key()] = (
+            self.credentials.access_token,
+            self.credentials.token_expiry,
+        )
+
+    def _restore_cached_token(self):
+        """Restores a still valid access token from token cache.
+
+        :returns: bool -- True if access token was restored.
+        """
+        cached = _TOKEN_CACHE.get(self._token_cache_key())
+        if cached is None:
+            return False
+        access_token, token_expiry = cached
+        if _epoch(token_expiry) - time.time() < TOKEN_EXPIRY_MARGIN:
+            return False
+        self.credentials.access_token = access_token
+        self.credentials.token_expiry = token_expiry
+        return True
 
     def GetDeviceCode(self):
         """Gets device code for device authentication.
@@ -807,19 +1133,19 @@ class GoogleAuth(ApiAttributeMixin):
             raise AuthenticationError("OAuth2 code exchange failed: %s" % e)
         print("Authentication successful.")
 
-    def _build_http(self):
+    def _build_http(self, share_connections=False):
         http = httplib2.Http(timeout=self.http_timeout)
-        # 308's are used by several Google APIs (Drive, YouTube)
-        # for Resumable Uploads rather than Permanent Redirects.
-        # This asks httplib2 to exclude 308s from the status codes
-        # it treats as redirects
-        # See also: https://stackoverflow.com/a/59850170/298182
-        try:
-            http.redirect_codes = http.redirect_codes - {308}
-        except AttributeError:
-            # http.redirect_codes does not exist in previous versions
-            # of httplib2, so pass
-            pass
+        if share_connections:
+            # Authorized Http objects are bound to credentials and can't be
+            # shared, but their connection pools can: reuse the current
+            # thread's open connections instead of a new TCP/TLS handshake.
+            # Only safe for objects that never leave the current thread.
+            pools = _thread_connections()
+            http.connections = pools.setdefault(
+                self.http_timeout, http.connections
+            )
+        if _HTTPLIB2_HAS_REDIRECT_CODES:
+            http.redirect_codes = _HTTP_REDIRECT_CODES
         return http
 
     def Authorize(self):
@@ -835,9 +1161,50 @@ class GoogleAuth(ApiAttributeMixin):
         if self.http is None:
             self.http = self._build_http()
         self.http = self.credentials.authorize(self.http)
-        self.service = build(
-            "drive", "v2", http=self.http, cache_discovery=False
-        )
+        # Building the service loads and parses the Drive discovery
+        # document, reuse the one loaded by any instance if possible.
+        document = _DISCOVERY_CACHE.get(("drive", "v2"))
+        if document is None:
+            self.service = build(
+                "drive", "v2", http=self.http, cache_discovery=False
+            )
+            _DISCOVERY_CACHE[("drive", "v2")] = self.service._rootDesc
+        else:
+            self.service = build_from_document(document, http=self.http)
+        self._update_ready_until()
+
+    def _ensure_http(self, kwargs):
+        """Picks a thread-safe HTTP object for a LoadAuth decorated call.
+
+        :param kwargs: keyword arguments of the call, an HTTP object passed
+            in its param is removed from it.
+        :type kwargs: dict.
+        :returns: httplib2.Http -- the HTTP object to use.
+        """
+        param = kwargs.get("param")
+        if param:
+            http = param.pop("http", None)
+            if http is not None:
+                return http
+        # If HTTP object not specified, create or resuse an HTTP object from
+        # the thread local storage.
+        thread_local = self.thread_local
+        try:
+            return thread_local.http
+        except AttributeError:
+            http = thread_local.http = self._thread_http_object()
+            return http
+
+    def _thread_http_object(self):
+        """Creates an authorized HTTP object for the current thread only.
+
+        It reuses the open connections of the current thread, so it must
+        not be handed over to other threads.
+
+        :returns: httplib2.Http -- the HTTP object.
+        """
+        http = self._build_http(share_connections=True)
+        return self.credentials.authorize(http)
 
     def Get_Http_Object(self):
         """Create and authorize an httplib2.Http object. Necessary for
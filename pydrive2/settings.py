@@ -1,6 +1,9 @@
+import copy
+import functools
+import os
+
 from yaml import load
 from yaml import YAMLError
-from redis import Redis
 
 try:
     from yaml import CLoader as Loader
@@ -96,8 +99,8 @@ SETTINGS_STRUCT = {
     "save_credentials_file": {"type": str, "required": False},
     "save_credentials_dict": {"type": dict, "required": False, "struct": {}},
     "save_credentials_key": {"type": str, "required": False},
-    "redis_host": {"type": str, "required": True},
-    "redis_port": {"type": int, "required": True},
+    "redis_host": {"type": str, "required": False},
+    "redis_port": {"type": int, "required": False},
     "redis_key": {"type": str, "required": False},
 }
 
@@ -118,11 +121,22 @@ def LoadSettingsFile(filename=SETTINGS_FILE):
     :raises: SettingsError
     """
     try:
-        with open(filename) as stream:
-            data = load(stream, Loader=Loader)
+        stat = os.stat(filename)
+        data = _LoadSettingsFile(
+            os.path.abspath(filename), stat.st_mtime_ns, stat.st_size
+        )
     except (YAMLError, OSError) as e:
         raise SettingsError(e)
-    return data
+    # Callers may modify settings, don't let them modify the cached copy.
+    return copy.deepcopy(data)
+
+
+@functools.lru_cache(maxsize=32)
+def _LoadSettingsFile(path, mtime_ns, size):
+    """Parses settings file, cached until its modification time or size
+    changes."""
+    with open(path) as stream:
+        return load(stream, Loader=Loader)
 
 
 def ValidateSettings(data):
@@ -1,33 +1,156 @@
+import datetime
+import json
+
 from oauth2client import client
 from redis import Redis
+from redis.exceptions import LockNotOwnedError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Members of OAuth2Credentials read back by OAuth2Credentials.from_json.
+_CREDENTIALS_FIELDS = (
+    "access_token",
+    "client_id",
+    "client_secret",
+    "refresh_token",
+    "token_uri",
+    "user_agent",
+    "revoke_uri",
+    "id_token",
+    "id_token_jwt",
+    "token_response",
+    "token_info_uri",
+    "invalid",
+)
+
+
+def _dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data)
+
+
+def _loads(serialized):
+    if orjson is not None:
+        return orjson.loads(serialized)
+    return json.loads(serialized)
+
+
+def _fast_creds_to_json(credentials: client.Credentials):
+    """Serializes credentials into the format of OAuth2Credentials.to_json.
+
+    Only plain OAuth2Credentials are serialized by hand, with just the
+    members needed to restore them, other credentials fall back to their
+    own to_json.
+    """
+    if type(credentials) is not client.OAuth2Credentials:
+        return credentials.to_json()
+    data = {
+        field: getattr(credentials, field) for field in _CREDENTIALS_FIELDS
+    }
+    expiry = credentials.token_expiry
+    data["token_expiry"] = (
+        expiry.strftime(client.EXPIRY_FORMAT) if expiry else None
+    )
+    data["scopes"] = sorted(credentials.scopes)
+    data["_class"] = "OAuth2Credentials"
+    data["_module"] = client.OAuth2Credentials.__module__
+    return _dumps(data)
+
+
+def _fast_creds_from_json(serialized):
+    """Deserializes credentials serialized by _fast_creds_to_json.
+
+    Credentials of other classes fall back to Credentials.new_from_json.
+    """
+    data = _loads(serialized)
+    if data.get("_class") != "OAuth2Credentials":
+        return client.Credentials.new_from_json(serialized)
+    expiry = data.get("token_expiry")
+    if expiry:
+        try:
+            expiry = datetime.datetime.strptime(expiry, client.EXPIRY_FORMAT)
+        except ValueError:
+            expiry = None
+    credentials = client.OAuth2Credentials(
+        data["access_token"],
+        data["client_id"],
+        data["client_secret"],
+        data["refresh_token"],
+        expiry,
+        data["token_uri"],
+        data["user_agent"],
+        revoke_uri=data.get("revoke_uri"),
+        id_token=data.get("id_token"),
+        id_token_jwt=data.get("id_token_jwt"),
+        token_response=data.get("token_response"),
+        scopes=data.get("scopes"),
+        token_info_uri=data.get("token_info_uri"),
+    )
+    credentials.invalid = data.get("invalid", False)
+    return credentials
 
 
 class RedisStorage(client.Storage):
-    def __init__(self, redis: Redis, key: str = "pydrive_oauth"):
-        super(RedisStorage, self).__init__(lock=redis.lock(key + "_lock"))
+    def __init__(
+        self,
+        redis: Redis,
+        key: str = "pydrive_oauth",
+        expiry_margin: int = 300,
+        lock_timeout: int = 30,
+    ):
+        # oauth2client holds this lock while refreshing credentials attached
+        # to this storage, so that only one client refreshes them at a time.
+        # The timeout keeps a crashed holder from blocking the others.
+        super(RedisStorage, self).__init__(
+            lock=redis.lock(key + "_lock", timeout=lock_timeout)
+        )
         self.redis = redis
         self.key = key
+        self.expiry_margin = expiry_margin
 
     def acquire_lock(self):
         self._lock.acquire(blocking=True)
 
     def release_lock(self):
-        self._lock.release()
+        try:
+            self._lock.release()
+        except LockNotOwnedError:
+            # Lock timed out and may already be held by another client.
+            pass
 
     def locked_get(self):
-        serialized = self.redis.get(self.key)
+        return self._deserialize(self.redis.get(self.key), self)
 
+    def locked_put(self, credentials: client.Credentials):
+        serialized = _fast_creds_to_json(credentials)
+        self.redis.set(self.key, serialized, ex=self._ttl(credentials))
+
+    def locked_delete(self):
+        self.redis.delete(self.key)
+
+    def _ttl(self, credentials: client.Credentials):
+        """Computes for how long (in seconds) credentials are worth storing.
+
+        Credentials holding a refresh token are kept until deleted, others
+        expire from Redis shortly before their access token does.
+        """
+        if credentials.refresh_token is not None:
+            return None
+        if credentials.token_expiry is None:
+            return None
+        remaining = credentials.token_expiry - datetime.datetime.utcnow()
+        return max(int(remaining.total_seconds()) - self.expiry_margin, 1)
+
+    @staticmethod
+    def _deserialize(serialized, store):
         if serialized is None:
             return None
 
-        credentials = client.OAuth2Credentials.from_json(serialized)
-        credentials.set_store(self)
+        credentials = _fast_creds_from_json(serialized)
+        credentials.set_store(store)
 
         return credentials
-
-    def locked_put(self, credentials: client.Credentials):
-        serialized = credentials.to_json()
-        self.redis.set(self.key, serialized)
-
-    def locked_delete(self):
-        self.redis.delete(self.key)
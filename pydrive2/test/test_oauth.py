@@ -1,22 +1,38 @@
+import datetime
 import json
 import os
+import threading
 import time
 import pytest
 
-from pydrive2.auth import GoogleAuth
+from pydrive2 import auth
+from pydrive2 import settings as settings_module
+from pydrive2.apiattr import ApiAttribute, ApiAttributeMixin
+from pydrive2.auth import GoogleAuth, LoadAuth
 from pydrive2.test.test_util import (
     setup_credentials,
     delete_file,
     settings_file_path,
     GDRIVE_USER_CREDENTIALS_DATA,
 )
+from oauth2client.client import DeviceFlowInfo, OAuth2Credentials
+from oauth2client.contrib.dictionary_storage import DictionaryStorage
 from oauth2client.file import Storage
+from pydrive2.storage import RedisStorage
+from redis.exceptions import LockNotOwnedError
 
 
 def setup_module(module):
     setup_credentials()
 
 
+@pytest.fixture(autouse=True)
+def auth_caches(monkeypatch):
+    # Keep tokens and documents cached by one test from leaking into others.
+    monkeypatch.setattr(auth, "_TOKEN_CACHE", {})
+    monkeypatch.setattr(auth, "_DISCOVERY_CACHE", {})
+
+
 @pytest.mark.manual
 def test_01_LocalWebserverAuthWithClientConfigFromFile():
     # Delete old credentials file
@@ -188,6 +204,488 @@ def test_12_ServiceAuthFromJsonDictNoCredentialsSaving():
     time.sleep(1)
 
 
+def _fake_credentials(expires_in):
+    expiry = datetime.datetime.utcnow() + datetime.timedelta(
+        seconds=expires_in
+    )
+    return OAuth2Credentials(
+        access_token="token-%d" % expires_in,
+        client_id="client_id",
+        client_secret="client_secret",
+        refresh_token="refresh_token",
+        token_expiry=expiry,
+        token_uri="https://oauth2.googleapis.com/token",
+        user_agent=None,
+    )
+
+
+def test_13_AccessTokenExpiresWithinMargin():
+    ga = GoogleAuth(settings_file=None)
+    ga.credentials = _fake_credentials(60)
+    assert ga.access_token_expired
+    ga.credentials = _fake_credentials(3600)
+    assert not ga.access_token_expired
+    # Refreshing replaces token_expiry of the same credentials.
+    ga.credentials.token_expiry = _fake_credentials(0).token_expiry
+    assert ga.access_token_expired
+    ga.credentials.invalid = True
+    ga.credentials.token_expiry = _fake_credentials(3600).token_expiry
+    assert ga.access_token_expired
+
+
+def test_14_RefreshReusesCachedAccessToken(mocker):
+    fresh = GoogleAuth(settings_file=None)
+    fresh.credentials = _fake_credentials(3600)
+    fresh._cache_token()
+
+    ga = GoogleAuth(settings_file=None)
+    ga.credentials = _fake_credentials(0)
+    spy = mocker.patch.object(OAuth2Credentials, "refresh")
+    ga.Refresh()
+    assert spy.call_count == 0
+    assert ga.credentials.access_token == "token-3600"
+    assert not ga.access_token_expired
+
+
+def test_15_HttpConnectionsSharedWithinThread():
+    ga1 = GoogleAuth(settings_file=None)
+    ga1.credentials = _fake_credentials(3600)
+    ga2 = GoogleAuth(settings_file=None)
+    ga2.credentials = _fake_credentials(3600)
+
+    http = ga1._thread_http_object()
+    assert ga2._thread_http_object().connections is http.connections
+    # Instance-wide and public Http objects may be used from any thread.
+    assert ga1._build_http().connections is not http.connections
+    public = ga1.Get_Http_Object(), ga1.Get_Http_Object()
+    assert public[0].connections is not http.connections
+    assert public[0].connections is not public[1].connections
+
+    assert 308 not in http.redirect_codes
+
+    other = []
+    thread = threading.Thread(
+        target=lambda: other.append(ga2._thread_http_object())
+    )
+    thread.start()
+    thread.join()
+    assert other[0].connections is not http.connections
+
+
+def _redis_auth(mocker, stored=None):
+    redis = mocker.MagicMock()
+    redis.get.return_value = stored.to_json() if stored else None
+    ga = GoogleAuth(settings_file=None)
+    ga._storages["redis"] = RedisStorage(redis, "creds")
+    ga._default_storage = ga._storages["redis"]
+    ga.credentials = _fake_credentials(0)
+    return ga, redis
+
+
+def test_16_RedisStorageExpiresOnlyCredentialsWithoutRefreshToken(mocker):
+    redis = mocker.MagicMock()
+    storage = RedisStorage(redis, "creds")
+    redis.lock.assert_called_once_with("creds_lock", timeout=30)
+
+    credentials = _fake_credentials(3600)
+    storage.locked_put(credentials)
+    assert redis.set.call_args.kwargs["ex"] is None
+
+    credentials.refresh_token = None
+    storage.locked_put(credentials)
+    assert 3290 <= redis.set.call_args.kwargs["ex"] <= 3300
+
+
+def test_17_RefreshAdoptsTokenStoredInRedis(mocker):
+    ga, redis = _redis_auth(mocker, stored=_fake_credentials(3600))
+    refresh = mocker.patch.object(OAuth2Credentials, "_do_refresh_request")
+    ga.Refresh()
+    assert refresh.call_count == 0
+    assert ga.credentials.access_token == "token-3600"
+    redis.set.assert_not_called()
+    lock = redis.lock.return_value
+    assert lock.acquire.call_count == lock.release.call_count == 1
+
+
+def test_18_RefreshUnderRedisLockStoresTokenOnce(mocker):
+    ga, redis = _redis_auth(mocker, stored=_fake_credentials(0))
+
+    def do_refresh(credentials, http):
+        credentials.access_token = "refreshed"
+        credentials.token_expiry = _fake_credentials(3600).token_expiry
+        credentials.store.locked_put(credentials)
+
+    mocker.patch.object(
+        OAuth2Credentials, "_do_refresh_request", autospec=True
+    ).side_effect = do_refresh
+    ga.Refresh()
+    assert ga.credentials.access_token == "refreshed"
+    assert redis.set.call_count == 1
+    lock = redis.lock.return_value
+    assert lock.acquire.call_count == lock.release.call_count == 1
+
+
+def test_19_RedisLockTimeoutDoesNotFailRelease(mocker):
+    ga, redis = _redis_auth(mocker, stored=_fake_credentials(3600))
+    redis.lock.return_value.release.side_effect = LockNotOwnedError()
+    ga.Refresh()
+    assert ga.credentials.access_token == "token-3600"
+
+
+def _client_settings():
+    return {
+        "client_config_backend": "settings",
+        "client_config": {
+            "client_id": "client_id",
+            "client_secret": "client_secret",
+            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+            "token_uri": "https://oauth2.googleapis.com/token",
+            "redirect_uri": "urn:ietf:wg:oauth:2.0:oob",
+            "revoke_uri": None,
+        },
+        "oauth_scope": [
+            "https://www.googleapis.com/auth/drive",
+            "https://www.googleapis.com/auth/drive.appdata",
+        ],
+    }
+
+
+def test_21_ReassignedSettingsAreResolved():
+    ga = GoogleAuth(settings_file=None)
+    assert not ga._save_credentials
+    ga.settings = dict(
+        _client_settings(),
+        save_credentials=True,
+        save_credentials_backend="dictionary",
+    )
+    assert ga._save_credentials
+    assert ga._save_credentials_backend == "dictionary"
+    ga.LoadClientConfig()
+    assert ga.client_config["client_id"] == "client_id"
+
+
+class _AuthorizedResource(ApiAttributeMixin):
+    auth = ApiAttribute("auth")
+
+    def __init__(self, auth):
+        ApiAttributeMixin.__init__(self)
+        self.auth = auth
+
+    @LoadAuth
+    def Call(self, param=None):
+        return self.http
+
+
+def _ready_auth(expires_in, ready_for):
+    ga = GoogleAuth(settings_file=None)
+    ga.credentials = _fake_credentials(expires_in)
+    ga.service = object()
+    ga.thread_local.http = object()
+    ga._ready_until = time.time() + ready_for
+    return ga
+
+
+def test_22_LoadAuthFastPathWhileTokenFresh(mocker):
+    ga = _ready_auth(expires_in=0, ready_for=60)
+    update = mocker.spy(ga, "_update_ready_until")
+    web = mocker.patch.object(GoogleAuth, "LocalWebserverAuth")
+    assert _AuthorizedResource(ga).Call() is ga.thread_local.http
+    assert update.call_count == 0
+    assert web.call_count == 0
+
+
+@pytest.mark.parametrize(
+    "auth_method, reauth",
+    [(None, "LocalWebserverAuth"), ("service", "ServiceAuth")],
+)
+def test_23_LoadAuthSlowPathOnceTokenExpires(mocker, auth_method, reauth):
+    ga = _ready_auth(expires_in=0, ready_for=-1)
+    ga.auth_method = auth_method
+
+    def authenticate():
+        ga.credentials = _fake_credentials(3600)
+
+    method = mocker.patch.object(ga, reauth, side_effect=authenticate)
+    _AuthorizedResource(ga).Call()
+    assert method.call_count == 1
+    assert ga._ready_until > time.time() + 3000
+
+    _AuthorizedResource(ga).Call()
+    assert method.call_count == 1
+
+
+def test_24_LoadAuthPopsHttpFromParam():
+    ga = _ready_auth(expires_in=3600, ready_for=60)
+    http = object()
+    param = {"http": http, "q": "title = 'a'"}
+    assert _AuthorizedResource(ga).Call(param=param) is http
+    assert param == {"q": "title = 'a'"}
+
+
+def test_25_GetFlowLoadsClientConfigOnce(mocker):
+    ga = GoogleAuth(settings=_client_settings())
+    load = mocker.spy(ga, "LoadClientConfig")
+    ga.GetFlow()
+    ga.GetFlow()
+    assert load.call_count == 1
+    assert ga.flow.scope == (
+        "https://www.googleapis.com/auth/drive "
+        "https://www.googleapis.com/auth/drive.appdata"
+    )
+
+    ga.client_config = {}
+    ga.GetFlow()
+    assert load.call_count == 2
+
+
+def test_26_DeviceAuthPollsUntilAuthorized(mocker):
+    ga = GoogleAuth(settings=_client_settings())
+    mocker.patch.object(
+        ga,
+        "GetDeviceCode",
+        return_value=DeviceFlowInfo(
+            device_code="device_code",
+            user_code="user_code",
+            interval=0,
+            verification_url="https://www.google.com/device",
+            user_code_expiry=None,
+        ),
+    )
+    pending = mocker.Mock(status_code=428)
+    pending.json.return_value = {"error": "authorization_pending"}
+    granted = mocker.Mock(status_code=200)
+    granted.json.return_value = {
+        "access_token": "access_token",
+        "refresh_token": "refresh_token",
+        "expires_in": 3599,
+    }
+    post = mocker.patch.object(
+        auth._SESSION, "post", side_effect=[pending, pending, granted]
+    )
+    ga.DeviceAuth()
+    assert post.call_count == 3
+    assert ga.credentials.access_token == "access_token"
+    assert ga.credentials.refresh_token == "refresh_token"
+    assert not ga.access_token_expired
+
+
+def test_27_DeviceAuthRejected(mocker):
+    ga = GoogleAuth(settings=_client_settings())
+    mocker.patch.object(
+        ga,
+        "GetDeviceCode",
+        return_value=DeviceFlowInfo(
+            "device_code", "user_code", 0, "https://google.com/device", None
+        ),
+    )
+    denied = mocker.Mock(status_code=403)
+    denied.json.return_value = {"error": "access_denied"}
+    mocker.patch.object(auth._SESSION, "post", return_value=denied)
+    with pytest.raises(auth.AuthenticationRejected):
+        ga.DeviceAuth()
+
+
+def test_28_SettingsFileParsedOnceUntilModified(mocker, tmp_path):
+    path = tmp_path / "settings.yaml"
+    path.write_text("save_credentials: False\n")
+    load = mocker.spy(settings_module, "load")
+
+    first = settings_module.LoadSettingsFile(str(path))
+    first["save_credentials"] = True
+    assert settings_module.LoadSettingsFile(str(path)) == {
+        "save_credentials": False
+    }
+    assert load.call_count == 1
+
+    path.write_text("save_credentials: True\n")
+    os.utime(path, ns=(0, 0))
+    assert settings_module.LoadSettingsFile(str(path)) == {
+        "save_credentials": True
+    }
+    assert load.call_count == 2
+
+
+def test_29_ClientSecretsParsedOnce(mocker):
+    auth._cached_load_clientsecrets.cache_clear()
+    loadfile = mocker.spy(auth.clientsecrets, "loadfile")
+    for _ in range(2):
+        ga = GoogleAuth(settings_file=None)
+        ga.LoadClientConfigFile(
+            os.path.join(os.path.dirname(__file__), "client_secrets.json")
+        )
+        assert ga.client_config["client_id"]
+    assert loadfile.call_count == 1
+
+
+def test_30_LoadServiceConfigSettingsKeepsClassConfigs():
+    settings = {
+        "client_config_backend": "service",
+        "service_config": {
+            "client_user_email": "user@example.com",
+            "client_service_email": "service@example.com",
+            "client_pkcs12_file_path": "key.p12",
+        },
+    }
+    for _ in range(2):
+        ga = GoogleAuth(settings=dict(settings))
+        ga.LoadServiceConfigSettings()
+        assert ga.client_config["client_service_email"] == (
+            "service@example.com"
+        )
+    assert GoogleAuth.SERVICE_CONFIGS_LIST == ["client_user_email"]
+
+
+def test_31_LoadClientConfigMarksConfigComplete():
+    ga = GoogleAuth(settings=_client_settings())
+    assert not ga._client_config_complete
+    ga.LoadClientConfigSettings()
+    assert ga._client_config_complete
+    ga.GetFlow()
+    assert ga.flow.revoke_uri == "https://oauth2.googleapis.com/revoke"
+    assert ga.flow.params["access_type"] == "online"
+
+
+def test_32_LoadAuthCreatesHttpOncePerThread(mocker):
+    ga = _ready_auth(expires_in=3600, ready_for=60)
+    del ga.thread_local.http
+    get_http = mocker.patch.object(
+        ga, "_thread_http_object", side_effect=lambda: object()
+    )
+    resource = _AuthorizedResource(ga)
+    http = resource.Call()
+    assert resource.Call() is http
+    assert get_http.call_count == 1
+
+
+def test_33_AuthorizeReusesDiscoveryDocument(mocker):
+    build = mocker.spy(auth, "build")
+    auths = []
+    for token in ("alice-token", "bob-token"):
+        ga = GoogleAuth(settings_file=None)
+        ga.credentials = _fake_credentials(3600)
+        ga.credentials.access_token = token
+        ga.credentials.refresh_token = None
+        ga.Authorize()
+        auths.append(ga)
+    assert build.call_count == 1
+
+    # Each user's service goes through that user's authorized Http.
+    alice, bob = auths
+    assert alice.service is not bob.service
+    assert alice.service._http is alice.http
+    assert bob.service._http is bob.http
+    assert bob.http is not alice.http
+
+    auth.invalidate_discovery_cache()
+    bob.Authorize()
+    assert build.call_count == 2
+
+
+def test_34_ConnectionsRecycledFromExitedThreads(monkeypatch):
+    monkeypatch.setattr(auth, "_HTTP_POOL", auth.queue.LifoQueue(maxsize=1))
+    ga = GoogleAuth(settings_file=None)
+    ga.credentials = _fake_credentials(3600)
+
+    def run():
+        http = ga._thread_http_object()
+        connections.append(http.connections)
+
+    connections = []
+    for _ in range(3):
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+    assert connections[0] is connections[1] is connections[2]
+    assert auth._HTTP_POOL.qsize() == 1
+
+
+def test_35_RedisStorageCredentialsRoundTrip(mocker):
+    redis = mocker.MagicMock()
+    storage = RedisStorage(redis, "creds")
+    credentials = _fake_credentials(3600)
+    credentials.id_token = {"email": "user@example.com"}
+    credentials.id_token_jwt = "header.payload.signature"
+    credentials.token_response = {"access_token": credentials.access_token}
+    storage.locked_put(credentials)
+    serialized = redis.set.call_args.args[1]
+    assert (
+        json.loads(serialized).keys()
+        == json.loads(credentials.to_json()).keys()
+    )
+
+    # Stays readable by oauth2client itself.
+    for loaded in (
+        OAuth2Credentials.from_json(serialized),
+        storage._deserialize(serialized, storage),
+    ):
+        assert loaded.access_token == credentials.access_token
+        assert loaded.refresh_token == credentials.refresh_token
+        assert loaded.token_expiry == credentials.token_expiry.replace(
+            microsecond=0
+        )
+        assert loaded.scopes == credentials.scopes
+        assert loaded.id_token == credentials.id_token
+        assert loaded.id_token_jwt == credentials.id_token_jwt
+        assert loaded.token_response == credentials.token_response
+        assert not loaded.invalid
+    assert storage._deserialize(serialized, storage).store is storage
+
+
+def test_36_RefreshedCredentialsSavedOnce(mocker):
+    creds_dict = {"creds": _fake_credentials(0).to_json()}
+    settings = dict(
+        _client_settings(),
+        save_credentials=True,
+        save_credentials_backend="dictionary",
+        save_credentials_dict=creds_dict,
+        save_credentials_key="creds",
+    )
+    ga = GoogleAuth(settings=settings)
+
+    def do_refresh(credentials, http):
+        credentials.access_token = "refreshed"
+        credentials.token_expiry = _fake_credentials(3600).token_expiry
+        credentials.store.locked_put(credentials)
+
+    mocker.patch.object(
+        OAuth2Credentials, "_do_refresh_request", autospec=True
+    ).side_effect = do_refresh
+    put = mocker.spy(DictionaryStorage, "locked_put")
+    ga.CommandLineAuth()
+    assert ga.credentials.access_token == "refreshed"
+    assert json.loads(creds_dict["creds"])["access_token"] == "refreshed"
+    assert put.call_count == 1
+
+    # Explicit saves are never skipped.
+    ga.SaveCredentials()
+    assert put.call_count == 2
+
+
+def test_37_ClientSecretsPrefetched(mocker):
+    auth._cached_load_clientsecrets.cache_clear()
+    loadfile = mocker.spy(auth.clientsecrets, "loadfile")
+    settings = dict(
+        _client_settings(),
+        client_config_backend="file",
+        client_config_file=os.path.join(
+            os.path.dirname(__file__), "client_secrets.json"
+        ),
+    )
+    ga = GoogleAuth(settings=settings)
+    assert ga._client_config_future is not None
+    ga.GetFlow()
+    assert ga.flow.client_id.endswith(".apps.googleusercontent.com")
+    assert ga._client_config_future is None
+    assert loadfile.call_count == 1
+
+    # A missing file is not prefetched, GetFlow still reports it.
+    settings["client_config_file"] = "missing_client_secrets.json"
+    ga = GoogleAuth(settings=settings)
+    assert ga._client_config_future is None
+    with pytest.raises(auth.InvalidConfigError):
+        ga.GetFlow()
+
+
 def CheckCredentialsFile(credentials, no_file=False):
     ga = GoogleAuth(settings_file_path("test_oauth_default.yaml"))
     ga.LoadCredentialsFile(credentials)